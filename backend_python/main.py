@@ -11,7 +11,7 @@ PURPOSE:
 FEATURES:
   - FastAPI framework with automatic OpenAPI documentation
   - File upload for resumes with validation (PDF only, 5MB max)
-  - MongoDB integration with PyMongo for data persistence
+  - MongoDB integration with Motor (async) for data persistence
   - CORS support for React frontend integration
   - Type hints and automatic request/response validation
   - AI-powered resume analysis and scoring
@@ -39,16 +39,18 @@ FILE MANAGEMENT:
   - Old file cleanup on replacement
   - File size and type validation
   - Secure file download with proper headers
+  - Optional nginx X-Accel-Redirect offload for downloads
 
 RESUME ANALYSIS:
   - Mock AI analysis with 10 category scoring
+  - Memory-mapped PDF scanning for resume section detection
   - Overall assessment and recommendations
   - Strengths and improvement suggestions
   - Confidence scoring and validation
   - Analysis result storage in database
 
 SECURITY FEATURES:
-  - File type validation (PDF only)
+  - File type validation (PDF only, checked by extension and %PDF- magic bytes)
   - File size limits (5MB maximum)
   - Secure filename generation
   - CORS configuration for frontend access
@@ -57,49 +59,147 @@ SECURITY FEATURES:
 
 PERFORMANCE CONSIDERATIONS:
   - Async/await for non-blocking operations
+  - CPU-bound resume analysis runs in a process pool, off the event loop
   - Efficient file I/O operations
+  - Cached static responses with ETag/304 revalidation
+  - GZip compression for JSON responses
   - Database connection pooling
   - Proper error handling and logging
   - Memory-efficient file processing
 
 DEPENDENCIES:
   - fastapi: Web framework with automatic docs
-  - pymongo: MongoDB driver
+  - motor: Async MongoDB driver (built on pymongo)
   - python-multipart: File upload support
   - pydantic: Data validation and serialization
   - uvicorn: ASGI server for production
   - python-dotenv: Environment variable management
+  - orjson: Fast JSON serialization for responses
 
 USAGE:
-  - Development: python run.py
-  - Production: uvicorn main:app --host 0.0.0.0 --port 3001
+  - Development: DEBUG=true python run.py
+  - Production: python run.py (WEB_CONCURRENCY worker processes)
+  - Production (uvicorn CLI): WEB_CONCURRENCY=4 uvicorn main:app --host 0.0.0.0 --port 3001
   - Docker: docker run -p 3001:3001 eagleai-python-backend
 ============================================================================
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, Query, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pymongo import MongoClient
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
-from typing import Optional, List
+from bson.errors import InvalidId
+from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
 import os
+import asyncio
+import multiprocessing
 import shutil
-from datetime import datetime
+import mmap
+import re
+import time
+import hashlib
+import uuid
+import orjson
+from datetime import datetime, timezone
 import logging
 from pathlib import Path
+from urllib.parse import quote
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def orjson_default(obj):
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class MongoORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also serializes MongoDB ObjectIds
+
+    FastAPI runs jsonable_encoder on plain return values before rendering, so
+    handlers that return raw MongoDB documents return this class directly to
+    skip that pass and let orjson handle ObjectIds and datetimes itself.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default)
+
+# MongoDB connection (created inside the lifespan so it is bound to the running event loop)
+MONGODB_URI = "mongodb://localhost:27017/"
+MONGODB_DATABASE = "eagleai-jobs"
+# Split the CPUs between server workers so WEB_CONCURRENCY pools don't oversubscribe them.
+# run.py exports WEB_CONCURRENCY; when it is unset this is a single-process server
+CPU_COUNT = os.cpu_count() or 1
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", max(1, CPU_COUNT // max(1, WEB_CONCURRENCY))))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the MongoDB client and analysis pool on startup and close them on shutdown"""
+    app.state.mongo = None
+    app.state.db = None
+    app.state.email_index_ready = False
+    # forkserver avoids forking this process once Motor's background threads are running;
+    # platforms without it (Windows) keep their default, spawn
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+    app.state.analysis_executor = ProcessPoolExecutor(
+        max_workers=ANALYSIS_WORKERS,
+        mp_context=multiprocessing.get_context(start_method)
+    )
+    try:
+        # Non-blocking I/O keeps connections busy, so a small pool is enough.
+        # tz_aware returns stored dates as UTC-aware datetimes with an offset
+        app.state.mongo = AsyncIOMotorClient(
+            MONGODB_URI,
+            tz_aware=True,
+            maxPoolSize=20,
+            minPoolSize=2,
+            maxIdleTimeMS=30000,
+            serverSelectionTimeoutMS=2000
+        )
+        app.state.db = app.state.mongo[MONGODB_DATABASE]
+        logger.info("Connected to MongoDB")
+    except Exception as e:
+        logger.error(f"Failed to connect to MongoDB: {e}")
+    
+    if app.state.db is not None:
+        students_collection = app.state.db["students"]
+        try:
+            await students_collection.create_index("email", unique=True)
+            app.state.email_index_ready = True
+        except Exception as e:
+            logger.error(f"Could not create unique email index, falling back to pre-insert checks: {e}")
+        try:
+            await students_collection.create_index(
+                "resumeFile.uploadedAt",
+                partialFilterExpression={"resumeFile": {"$exists": True}}
+            )
+        except Exception as e:
+            logger.warning(f"Could not create resume upload index: {e}")
+    yield
+    if app.state.mongo is not None:
+        app.state.mongo.close()
+    app.state.analysis_executor.shutdown()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="EagleAI Backend API",
     description="Backend API for EagleAI job matching and resume storage system",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=MongoORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -111,25 +211,93 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class ETagMiddleware:
+    """Add ETag/Cache-Control to small static responses and answer 304 on a match"""
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        cache_control = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            cache_control = ETAG_CACHE_CONTROL.get(scope["path"])
+        if cache_control is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        body_parts = []
+        
+        async def buffered_send(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            
+            body = b"".join(body_parts)
+            if start_message["status"] == 200:
+                # Weak ETag: GZip runs outside this middleware, so the same
+                # validator covers both the identity and gzip-encoded bodies
+                opaque_tag = f'"{hashlib.md5(body).hexdigest()}"'
+                headers = MutableHeaders(scope=start_message)
+                headers["ETag"] = f"W/{opaque_tag}"
+                headers["Cache-Control"] = cache_control
+                if_none_match = Headers(scope=scope).get("if-none-match", "")
+                client_tags = {tag.strip() for tag in if_none_match.split(",")}
+                client_tags |= {tag[2:] for tag in client_tags if tag.startswith("W/")}
+                if opaque_tag in client_tags or "*" in client_tags:
+                    start_message["status"] = 304
+                    del headers["content-length"]
+                    del headers["content-type"]
+                    body = b""
+            
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+        
+        await self.app(scope, receive, buffered_send)
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip middleware that skips resume downloads, since PDFs are already compressed"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/resume/download"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(ETagMiddleware)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024)
+
 # Configuration
-UPLOAD_DIR = Path("uploads/resumes")
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads/resumes"))
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-
-# MongoDB connection
-try:
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["eagleai-jobs"]
-    students_collection = db["students"]
-    jobs_collection = db["jobs"]
-    logger.info("Connected to MongoDB")
-except Exception as e:
-    logger.error(f"Failed to connect to MongoDB: {e}")
-    db = None
+COPY_BUFFER_SIZE = 1024 * 1024  # 1MB
+PDF_MAGIC = b"%PDF-"
+UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+# Paths whose responses get an ETag, with the Cache-Control header to send
+ETAG_CACHE_CONTROL = {
+    "/": "public, max-age=60",
+    "/openapi.json": "public, max-age=60",
+    "/health": "no-cache"
+}
+# Byte strings searched for in the raw PDF. Text in compressed content streams
+# is not visible to this scan, so a miss does not mean the section is absent
+RESUME_SECTION_KEYWORDS = {
+    "education": b"Education",
+    "experience": b"Experience",
+    "skills": b"Skills",
+    "projects": b"Projects"
+}
+# When set (e.g. "/_protected/resumes/"), downloads are handed off to nginx
+# via X-Accel-Redirect instead of being streamed through the app. Requires an
+# internal nginx location aliased to UPLOAD_DIR (see backend/nginx.conf)
+X_ACCEL_REDIRECT_PREFIX = os.getenv("X_ACCEL_REDIRECT_PREFIX")
 
 # Pydantic models for request/response validation
 from pydantic import BaseModel, EmailStr
-from typing import Dict, Any
 
 class StudentCreate(BaseModel):
     name: str
@@ -146,33 +314,198 @@ class ResumeInfo(BaseModel):
     id: str
     fileName: str
     fileUrl: str
-    uploadedAt: str
+    uploadedAt: datetime
     fileSize: int
     analysis: Optional[Dict[str, Any]] = None
+    analysisStatus: Optional[Dict[str, Any]] = None
 
 class ResumeUploadResponse(BaseModel):
     message: str
     resume: ResumeInfo
 
-# Health check endpoint
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
+def save_upload(source, file_path: Path, max_size: int) -> int:
+    """Copy an uploaded file object to disk and return the number of bytes written"""
+    # Write to a temporary file and rename it into place so a crash never leaves a partial file
+    temp_path = file_path.with_name(file_path.name + ".part")
+    try:
+        with open(temp_path, "wb") as buffer:
+            shutil.copyfileobj(source, buffer, COPY_BUFFER_SIZE)
+            file_size = buffer.tell()
+        # Oversized files are rejected while still in the .part file
+        if file_size > max_size:
+            raise ValueError("File too large")
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return file_size
+
+def analyze_resume_file(file_path: str) -> Dict[str, Any]:
+    """Scan a stored resume PDF via mmap and build its analysis"""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Resume file is not a valid PDF")
+        
+        # Map the file read-only so only the pages actually scanned are loaded
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            
+            if mm[:len(PDF_MAGIC)] != PDF_MAGIC:
+                raise ValueError("Resume file is not a valid PDF")
+            
+            # Raw-byte hint only: most PDFs Flate-compress their text
+            raw_keyword_hits = {
+                section: mm.find(keyword) != -1
+                for section, keyword in RESUME_SECTION_KEYWORDS.items()
+            }
+    
+    # Mock scoring - in real implementation, you'd extract text from PDF and use AI
     return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "database": "connected" if db else "disconnected",
+        "overallScore": 8.5,
+        "categoryScores": {
+            "bulletPoints": 8,
+            "header": 9,
+            "education": 8,
+            "experience": 9,
+            "secondarySections": 7,
+            "formatting": 8,
+            "language": 8,
+            "contentQuality": 9,
+            "targeting": 8,
+            "universalStandards": 8
+        },
+        "strengths": [
+            "Strong technical skills section",
+            "Quantified achievements in experience",
+            "Clear and concise formatting"
+        ],
+        "priorityImprovements": [
+            "Add more specific metrics to bullet points",
+            "Include relevant keywords for target roles"
+        ],
+        "overallAssessment": "Strong resume with good technical content and clear structure.",
+        "rawKeywordHits": raw_keyword_hits,
+        "lastAnalyzed": datetime.now(timezone.utc).isoformat()
+    }
+
+async def run_resume_analysis(
+    executor: Executor,
+    students_collection: AsyncIOMotorCollection,
+    student_oid: ObjectId,
+    file_path: str,
+    task_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Analyze a stored resume in the process pool and save the result"""
+    # The path is sent instead of file contents; the worker maps the file itself
+    loop = asyncio.get_running_loop()
+    analysis = await loop.run_in_executor(executor, analyze_resume_file, file_path)
+    await students_collection.update_one(
+        {"_id": student_oid},
+        {"$set": {
+            "resumeAnalysis": analysis,
+            "resumeAnalysisStatus": {
+                "taskId": task_id,
+                "status": "completed",
+                "updatedAt": datetime.now(timezone.utc)
+            }
+        }}
+    )
+    return analysis
+
+async def run_resume_analysis_task(
+    executor: Executor,
+    students_collection: AsyncIOMotorCollection,
+    student_oid: ObjectId,
+    file_path: str,
+    task_id: str
+) -> None:
+    """Background task wrapper for run_resume_analysis that records failures"""
+    try:
+        await run_resume_analysis(executor, students_collection, student_oid, file_path, task_id)
+    except Exception as e:
+        logger.error(f"Error analyzing resume in background: {e}")
+        # Same client-facing messages as the synchronous analyze endpoint
+        if isinstance(e, FileNotFoundError):
+            error = "Resume file not found on disk"
+        elif isinstance(e, ValueError):
+            error = str(e)
+        else:
+            error = "Failed to analyze resume"
+        # Only mark this task failed; a newer queued task keeps its own status
+        try:
+            await students_collection.update_one(
+                {"_id": student_oid, "resumeAnalysisStatus.taskId": task_id},
+                {"$set": {
+                    "resumeAnalysisStatus.status": "failed",
+                    "resumeAnalysisStatus.error": error,
+                    "resumeAnalysisStatus.updatedAt": datetime.now(timezone.utc)
+                }}
+            )
+        except Exception as e:
+            logger.error(f"Could not record failed resume analysis: {e}")
+
+def get_students_collection(request: Request) -> AsyncIOMotorCollection:
+    """Students collection from the app-wide MongoDB client"""
+    if request.app.state.db is None:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return request.app.state.db["students"]
+
+def get_analysis_executor(request: Request) -> Executor:
+    """Process pool used for CPU-bound resume analysis"""
+    return request.app.state.analysis_executor
+
+def get_student_oid(student_id: str) -> ObjectId:
+    """Parse the student_id path parameter once, rejecting malformed ids with 400"""
+    try:
+        return ObjectId(student_id)
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid student id")
+
+def remove_file(file_path: Path) -> None:
+    """Delete a file from disk, logging instead of raising on failure"""
+    try:
+        file_path.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning(f"Could not delete resume file {file_path}: {e}")
+
+# Health check endpoint
+@lru_cache(maxsize=1)
+def health_body(second: int, database: str, email_index: str) -> bytes:
+    """Serialized health payload, rebuilt at most once per second"""
+    return MongoORJSONResponse({
+        "status": "healthy" if email_index == "ready" else "degraded",
+        "timestamp": datetime.fromtimestamp(second, timezone.utc).isoformat(),
+        "database": database,
+        "emailIndex": email_index,
         "api": "FastAPI",
         "version": "1.0.0"
-    }
+    }).body
+
+@app.get("/health")
+async def health_check(request: Request):
+    """Health check endpoint"""
+    database = "connected" if request.app.state.db is not None else "disconnected"
+    email_index = "ready" if request.app.state.email_index_ready else "missing"
+    return Response(
+        content=health_body(int(time.time()), database, email_index),
+        media_type="application/json"
+    )
 
 # Resume Storage Endpoints
 
 @app.get("/api/students/{student_id}/resume", response_model=ResumeInfo)
-async def get_student_resume(student_id: str):
+async def get_student_resume(
+    student_id: str,
+    student_oid: ObjectId = Depends(get_student_oid),
+    students_collection: AsyncIOMotorCollection = Depends(get_students_collection)
+):
     """Get student's stored resume"""
     try:
-        student = students_collection.find_one({"_id": ObjectId(student_id)})
+        student = await students_collection.find_one(
+            {"_id": student_oid},
+            {"resumeFile": 1, "resumeAnalysis": 1, "resumeAnalysisStatus": 1}
+        )
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         
@@ -186,9 +519,12 @@ async def get_student_resume(student_id: str):
             fileUrl=f"/api/students/{student_id}/resume/download",
             uploadedAt=resume_data["uploadedAt"],
             fileSize=resume_data["fileSize"],
-            analysis=student.get("resumeAnalysis")
+            analysis=student.get("resumeAnalysis"),
+            analysisStatus=student.get("resumeAnalysisStatus")
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching resume: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch resume")
@@ -196,6 +532,9 @@ async def get_student_resume(student_id: str):
 @app.post("/api/students/{student_id}/resume", response_model=ResumeUploadResponse)
 async def upload_student_resume(
     student_id: str,
+    background_tasks: BackgroundTasks,
+    student_oid: ObjectId = Depends(get_student_oid),
+    students_collection: AsyncIOMotorCollection = Depends(get_students_collection),
     resume: UploadFile = File(..., description="Resume PDF file")
 ):
     """Upload/Replace student resume"""
@@ -204,52 +543,59 @@ async def upload_student_resume(
         if not resume.filename.endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
         
-        # Check file size
-        content = await resume.read()
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=413, detail="File too large. Maximum size is 5MB")
-        
-        # Get student
-        student = students_collection.find_one({"_id": ObjectId(student_id)})
-        if not student:
-            raise HTTPException(status_code=404, detail="Student not found")
-        
-        # Generate secure filename
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        filename = f"resume-{student_id}-{timestamp}-{resume.filename}"
+        # Generate secure filename (sanitized so the client name cannot escape UPLOAD_DIR)
+        safe_name = UNSAFE_FILENAME_CHARS.sub("_", resume.filename)[-64:]
+        filename = f"resume-{student_id}-{time.time_ns()}-{safe_name}"
         file_path = UPLOAD_DIR / filename
         
-        # Delete old resume file if it exists
-        if "resumeFile" in student and "filePath" in student["resumeFile"]:
-            old_file_path = Path(student["resumeFile"]["filePath"])
-            if old_file_path.exists():
-                try:
-                    old_file_path.unlink()
-                except Exception as e:
-                    logger.warning(f"Could not delete old resume file: {e}")
+        # Check file size (known up front once the multipart body is spooled)
+        if resume.size is not None and resume.size > MAX_FILE_SIZE:
+            raise HTTPException(status_code=413, detail="File too large. Maximum size is 5MB")
         
-        # Save new file
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
+        # Check PDF magic bytes before anything is written to disk
+        header = await resume.read(8)
+        if not header.startswith(PDF_MAGIC):
+            raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+        await resume.seek(0)
         
-        # Update student document
+        # Copy spooled upload to disk in a single worker thread
+        try:
+            file_size = await run_in_threadpool(save_upload, resume.file, file_path, MAX_FILE_SIZE)
+        except ValueError:
+            raise HTTPException(status_code=413, detail="File too large. Maximum size is 5MB")
+        
+        # Update student document, getting the previous resume back in the same round trip
         resume_data = {
             "originalName": resume.filename,
             "fileName": filename,
             "filePath": str(file_path),
-            "fileSize": len(content),
-            "uploadedAt": datetime.now().isoformat()
+            "fileSize": file_size,
+            "uploadedAt": datetime.now(timezone.utc)
         }
         
-        students_collection.update_one(
-            {"_id": ObjectId(student_id)},
-            {"$set": {"resumeFile": resume_data}}
-        )
+        try:
+            previous = await students_collection.find_one_and_update(
+                {"_id": student_oid},
+                {"$set": {"resumeFile": resume_data}},
+                projection={"resumeFile": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+        except Exception:
+            file_path.unlink(missing_ok=True)
+            raise
+        if previous is None:
+            file_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=404, detail="Student not found")
+        
+        # Delete old resume file after the response is sent
+        old_file = previous.get("resumeFile", {}).get("filePath")
+        if old_file and Path(old_file) != file_path:
+            background_tasks.add_task(remove_file, Path(old_file))
         
         return ResumeUploadResponse(
             message="Resume uploaded successfully",
             resume=ResumeInfo(
-                id=str(student["_id"]),
+                id=str(previous["_id"]),
                 fileName=resume_data["originalName"],
                 fileUrl=f"/api/students/{student_id}/resume/download",
                 uploadedAt=resume_data["uploadedAt"],
@@ -264,10 +610,16 @@ async def upload_student_resume(
         raise HTTPException(status_code=500, detail="Failed to upload resume")
 
 @app.get("/api/students/{student_id}/resume/download")
-async def download_student_resume(student_id: str):
+async def download_student_resume(
+    student_oid: ObjectId = Depends(get_student_oid),
+    students_collection: AsyncIOMotorCollection = Depends(get_students_collection)
+):
     """Download student resume file"""
     try:
-        student = students_collection.find_one({"_id": ObjectId(student_id)})
+        student = await students_collection.find_one(
+            {"_id": student_oid},
+            {"resumeFile.filePath": 1, "resumeFile.originalName": 1}
+        )
         if not student or "resumeFile" not in student:
             raise HTTPException(status_code=404, detail="Resume not found")
         
@@ -275,9 +627,24 @@ async def download_student_resume(student_id: str):
         if not file_path.exists():
             raise HTTPException(status_code=404, detail="Resume file not found on disk")
         
+        original_name = student["resumeFile"]["originalName"]
+        if X_ACCEL_REDIRECT_PREFIX:
+            quoted_name = quote(original_name)
+            if quoted_name != original_name:
+                content_disposition = f"attachment; filename*=utf-8''{quoted_name}"
+            else:
+                content_disposition = f'attachment; filename="{original_name}"'
+            return Response(
+                media_type="application/pdf",
+                headers={
+                    "X-Accel-Redirect": f"{X_ACCEL_REDIRECT_PREFIX}{quote(file_path.name)}",
+                    "Content-Disposition": content_disposition
+                }
+            )
+        
         return FileResponse(
             path=str(file_path),
-            filename=student["resumeFile"]["originalName"],
+            filename=original_name,
             media_type="application/pdf"
         )
     
@@ -288,54 +655,68 @@ async def download_student_resume(student_id: str):
         raise HTTPException(status_code=500, detail="Failed to download resume")
 
 @app.post("/api/students/{student_id}/resume/analyze")
-async def analyze_student_resume(student_id: str):
+async def analyze_student_resume(
+    background_tasks: BackgroundTasks,
+    student_oid: ObjectId = Depends(get_student_oid),
+    students_collection: AsyncIOMotorCollection = Depends(get_students_collection),
+    analysis_executor: Executor = Depends(get_analysis_executor),
+    background: bool = Query(False, description="Queue the analysis and return immediately")
+):
     """Analyze stored resume"""
     try:
-        student = students_collection.find_one({"_id": ObjectId(student_id)})
+        student = await students_collection.find_one(
+            {"_id": student_oid},
+            {"resumeFile.filePath": 1}
+        )
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         
         if "resumeFile" not in student:
             raise HTTPException(status_code=400, detail="No resume file found. Please upload a resume first.")
         
-        # Mock analysis - in real implementation, you'd extract text from PDF and use AI
-        analysis = {
-            "overallScore": 8.5,
-            "categoryScores": {
-                "bulletPoints": 8,
-                "header": 9,
-                "education": 8,
-                "experience": 9,
-                "secondarySections": 7,
-                "formatting": 8,
-                "language": 8,
-                "contentQuality": 9,
-                "targeting": 8,
-                "universalStandards": 8
-            },
-            "strengths": [
-                "Strong technical skills section",
-                "Quantified achievements in experience",
-                "Clear and concise formatting"
-            ],
-            "priorityImprovements": [
-                "Add more specific metrics to bullet points",
-                "Include relevant keywords for target roles"
-            ],
-            "overallAssessment": "Strong resume with good technical content and clear structure.",
-            "lastAnalyzed": datetime.now().isoformat()
-        }
+        file_path = student["resumeFile"]["filePath"]
         
-        # Update student with analysis
-        students_collection.update_one(
-            {"_id": ObjectId(student_id)},
-            {"$set": {"resumeAnalysis": analysis}}
-        )
+        # Queued analyses are saved to the student and returned by GET /resume,
+        # whose analysisStatus carries the taskId and queued/completed/failed
+        if background:
+            task_id = uuid.uuid4().hex
+            await students_collection.update_one(
+                {"_id": student["_id"]},
+                {"$set": {"resumeAnalysisStatus": {
+                    "taskId": task_id,
+                    "status": "queued",
+                    "updatedAt": datetime.now(timezone.utc)
+                }}}
+            )
+            background_tasks.add_task(
+                run_resume_analysis_task,
+                analysis_executor,
+                students_collection,
+                student["_id"],
+                file_path,
+                task_id
+            )
+            return MongoORJSONResponse(
+                status_code=202,
+                content={"message": "Resume analysis queued", "taskId": task_id, "status": "queued"}
+            )
         
-        return {
+        try:
+            analysis = await run_resume_analysis(
+                analysis_executor,
+                students_collection,
+                student["_id"],
+                file_path
+            )
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Resume file not found on disk")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        return MongoORJSONResponse({
             "message": "Resume analyzed successfully",
             "analysis": analysis
-        }
+        })
     
     except HTTPException:
         raise
@@ -344,29 +725,25 @@ async def analyze_student_resume(student_id: str):
         raise HTTPException(status_code=500, detail="Failed to analyze resume")
 
 @app.delete("/api/students/{student_id}/resume")
-async def delete_student_resume(student_id: str):
+async def delete_student_resume(
+    background_tasks: BackgroundTasks,
+    student_oid: ObjectId = Depends(get_student_oid),
+    students_collection: AsyncIOMotorCollection = Depends(get_students_collection)
+):
     """Delete student resume"""
     try:
-        student = students_collection.find_one({"_id": ObjectId(student_id)})
-        if not student:
-            raise HTTPException(status_code=404, detail="Student not found")
-        
-        if "resumeFile" not in student:
+        # Clear resume data in one round trip, getting the old file path back
+        previous = await students_collection.find_one_and_update(
+            {"_id": student_oid, "resumeFile": {"$exists": True}},
+            {"$unset": {"resumeFile": "", "resumeText": "", "resumeAnalysis": "", "resumeAnalysisStatus": ""}},
+            projection={"resumeFile.filePath": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        if previous is None:
             raise HTTPException(status_code=404, detail="No resume found")
         
-        # Delete file from disk
-        file_path = Path(student["resumeFile"]["filePath"])
-        if file_path.exists():
-            try:
-                file_path.unlink()
-            except Exception as e:
-                logger.warning(f"Could not delete resume file: {e}")
-        
-        # Clear resume data from student
-        students_collection.update_one(
-            {"_id": ObjectId(student_id)},
-            {"$unset": {"resumeFile": "", "resumeText": "", "resumeAnalysis": ""}}
-        )
+        # Delete file from disk after the response is sent
+        background_tasks.add_task(remove_file, Path(previous["resumeFile"]["filePath"]))
         
         return {"message": "Resume deleted successfully"}
     
@@ -379,27 +756,39 @@ async def delete_student_resume(student_id: str):
 # Student management endpoints
 
 @app.get("/api/students")
-async def get_students():
+async def get_students(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    students_collection: AsyncIOMotorCollection = Depends(get_students_collection)
+):
     """Get list of students"""
     try:
-        students = list(students_collection.find({}, {"resumeFile": 0, "resumeText": 0, "resumeAnalysis": 0}))
-        for student in students:
-            student["_id"] = str(student["_id"])
-        return {"students": students}
+        # Project and stringify _id server-side so no Python pass over the results is needed
+        pipeline = [
+            {"$project": {"resumeFile": 0, "resumeText": 0, "resumeAnalysis": 0, "resumeAnalysisStatus": 0}},
+            {"$sort": {"_id": 1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$addFields": {"_id": {"$toString": "$_id"}}}
+        ]
+        students = await students_collection.aggregate(pipeline).to_list(length=limit)
+        return MongoORJSONResponse({"students": students})
     except Exception as e:
         logger.error(f"Error fetching students: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch students")
 
 @app.get("/api/students/{student_id}")
-async def get_student(student_id: str):
+async def get_student(
+    student_oid: ObjectId = Depends(get_student_oid),
+    students_collection: AsyncIOMotorCollection = Depends(get_students_collection)
+):
     """Get specific student"""
     try:
-        student = students_collection.find_one({"_id": ObjectId(student_id)})
+        student = await students_collection.find_one({"_id": student_oid})
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         
-        student["_id"] = str(student["_id"])
-        return student
+        return MongoORJSONResponse(student)
     except HTTPException:
         raise
     except Exception as e:
@@ -407,23 +796,29 @@ async def get_student(student_id: str):
         raise HTTPException(status_code=500, detail="Failed to fetch student")
 
 @app.post("/api/students")
-async def create_student(student: StudentCreate):
+async def create_student(
+    request: Request,
+    student: StudentCreate,
+    students_collection: AsyncIOMotorCollection = Depends(get_students_collection)
+):
     """Create new student"""
     try:
-        # Check if student already exists
-        existing_student = students_collection.find_one({"email": student.email})
-        if existing_student:
-            raise HTTPException(status_code=409, detail="Student with this email already exists")
+        # Without the unique index, fall back to checking for an existing student first
+        if not request.app.state.email_index_ready:
+            existing_student = await students_collection.find_one({"email": student.email}, {"_id": 1})
+            if existing_student:
+                raise HTTPException(status_code=409, detail="Student with this email already exists")
         
-        # Create student document
-        student_data = student.dict()
-        student_data.update({
-            "isActive": True,
-            "createdAt": datetime.now().isoformat(),
-            "lastLogin": datetime.now().isoformat()
-        })
+        # Create student document (dates stored as BSON datetimes so they can be indexed and ranged)
+        now = datetime.now(timezone.utc)
+        student_data = student.model_dump()
+        student_data.update(isActive=True, createdAt=now, lastLogin=now)
         
-        result = students_collection.insert_one(student_data)
+        # Uniqueness is normally enforced by the unique index on email
+        try:
+            result = await students_collection.insert_one(student_data)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail="Student with this email already exists")
         
         return {
             "message": "Student created successfully",
@@ -443,15 +838,20 @@ async def create_student(student: StudentCreate):
         raise HTTPException(status_code=500, detail="Failed to create student")
 
 # Root endpoint
-@app.get("/")
-async def root():
-    """Root endpoint with API information"""
-    return {
+@lru_cache(maxsize=1)
+def root_body() -> bytes:
+    """Serialized root payload, built once"""
+    return MongoORJSONResponse({
         "message": "EagleAI Backend API",
         "version": "1.0.0",
         "docs": "/docs",
         "health": "/health"
-    }
+    }).body
+
+@app.get("/")
+async def root():
+    """Root endpoint with API information"""
+    return Response(content=root_body(), media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
@@ -8,7 +8,12 @@ PURPOSE:
   Handles environment setup and server initialization.
 
 USAGE:
-  python run.py
+  python run.py              # production: multiple workers (uvloop/httptools when installed)
+  DEBUG=true python run.py   # development: single worker with auto-reload
+
+ENVIRONMENT:
+  DEBUG            - Enable auto-reload for development (default: false)
+  WEB_CONCURRENCY  - Number of worker processes (default: CPU count, 1 with DEBUG)
 ============================================================================
 """
 
@@ -20,22 +25,39 @@ def main():
     """Start the FastAPI server"""
     # Set environment variables
     os.environ['PYTHONPATH'] = str(Path(__file__).parent)
+    debug = os.getenv('DEBUG', 'false').lower() == 'true'
+    workers = 1 if debug else int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1))
+    # Exported so each worker sizes its analysis pool to its share of the CPUs
+    os.environ['WEB_CONCURRENCY'] = str(workers)
     
     print("🚀 Starting EagleAI FastAPI Backend Server...")
     print("📍 Server will run on: http://localhost:3001")
     print("🔗 Health check: http://localhost:3001/health")
     print("📚 API docs: http://localhost:3001/docs")
     print("📖 ReDoc: http://localhost:3001/redoc")
+    if debug:
+        print("🔄 Development mode: auto-reload enabled")
+    else:
+        print(f"⚙️  Production mode: {workers} workers")
     print("=" * 50)
     
     try:
-        uvicorn.run(
-            "main:app",
-            host="0.0.0.0",
-            port=3001,
-            reload=True,
-            log_level="info"
-        )
+        if debug:
+            uvicorn.run(
+                "main:app",
+                host="0.0.0.0",
+                port=3001,
+                reload=True,
+                log_level="info"
+            )
+        else:
+            uvicorn.run(
+                "main:app",
+                host="0.0.0.0",
+                port=3001,
+                workers=workers,
+                log_level="info"
+            )
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
     except Exception as e:
@@ -6,14 +6,17 @@ FILE: backend_python/test_api.py
 PURPOSE:
   Test script to verify the FastAPI backend API endpoints.
   Tests all major functionality including file uploads.
+  Uses a single httpx.AsyncClient so connections are reused, and runs
+  independent tests concurrently.
 
 USAGE:
+  pip install -r requirements.txt
   python test_api.py
 ============================================================================
 """
 
-import requests
-import json
+import asyncio
+import httpx
 import os
 from datetime import datetime
 
@@ -21,11 +24,11 @@ from datetime import datetime
 BASE_URL = "http://localhost:3001"
 TEST_STUDENT_ID = "507f1f77bcf86cd799439011"  # Mock ObjectId
 
-def test_health():
+async def test_health(client):
     """Test health check endpoint"""
     print("🔍 Testing health check...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = await client.get("/health")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Health check passed: {data['status']} (API: {data['api']})")
@@ -37,11 +40,11 @@ def test_health():
         print(f"❌ Health check error: {e}")
         return False
 
-def test_api_docs():
+async def test_api_docs(client):
     """Test API documentation endpoint"""
     print("🔍 Testing API documentation...")
     try:
-        response = requests.get(f"{BASE_URL}/docs")
+        response = await client.get("/docs")
         if response.status_code == 200:
             print("✅ API documentation accessible")
             return True
@@ -52,7 +55,7 @@ def test_api_docs():
         print(f"❌ API docs error: {e}")
         return False
 
-def test_create_student():
+async def test_create_student(client):
     """Test student creation"""
     print("🔍 Testing student creation...")
     try:
@@ -64,7 +67,7 @@ def test_create_student():
             "graduationYear": 2024
         }
         
-        response = requests.post(f"{BASE_URL}/api/students", json=student_data)
+        response = await client.post("/api/students", json=student_data)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Student created: {data['student']['name']}")
@@ -76,7 +79,7 @@ def test_create_student():
         print(f"❌ Student creation error: {e}")
         return None
 
-def test_resume_upload(student_id):
+async def test_resume_upload(client, student_id):
     """Test resume upload"""
     print("🔍 Testing resume upload...")
     try:
@@ -87,7 +90,7 @@ def test_resume_upload(student_id):
         
         with open(test_file_path, "rb") as f:
             files = {"resume": f}
-            response = requests.post(f"{BASE_URL}/api/students/{student_id}/resume", files=files)
+            response = await client.post(f"/api/students/{student_id}/resume", files=files)
         
         # Clean up test file
         if os.path.exists(test_file_path):
@@ -104,11 +107,11 @@ def test_resume_upload(student_id):
         print(f"❌ Resume upload error: {e}")
         return False
 
-def test_resume_analysis(student_id):
+async def test_resume_analysis(client, student_id):
     """Test resume analysis"""
     print("🔍 Testing resume analysis...")
     try:
-        response = requests.post(f"{BASE_URL}/api/students/{student_id}/resume/analyze")
+        response = await client.post(f"/api/students/{student_id}/resume/analyze")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Resume analyzed: Score {data['analysis']['overallScore']}")
@@ -120,11 +123,11 @@ def test_resume_analysis(student_id):
         print(f"❌ Resume analysis error: {e}")
         return False
 
-def test_resume_download(student_id):
+async def test_resume_download(client, student_id):
     """Test resume download"""
     print("🔍 Testing resume download...")
     try:
-        response = requests.get(f"{BASE_URL}/api/students/{student_id}/resume/download")
+        response = await client.get(f"/api/students/{student_id}/resume/download")
         if response.status_code == 200:
             print(f"✅ Resume downloaded: {len(response.content)} bytes")
             return True
@@ -135,11 +138,11 @@ def test_resume_download(student_id):
         print(f"❌ Resume download error: {e}")
         return False
 
-def test_get_resume(student_id):
+async def test_get_resume(client, student_id):
     """Test get resume info"""
     print("🔍 Testing get resume info...")
     try:
-        response = requests.get(f"{BASE_URL}/api/students/{student_id}/resume")
+        response = await client.get(f"/api/students/{student_id}/resume")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Resume info retrieved: {data['fileName']}")
@@ -151,11 +154,11 @@ def test_get_resume(student_id):
         print(f"❌ Get resume error: {e}")
         return False
 
-def test_root_endpoint():
+async def test_root_endpoint(client):
     """Test root endpoint"""
     print("🔍 Testing root endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = await client.get("/")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Root endpoint: {data['message']}")
@@ -167,48 +170,46 @@ def test_root_endpoint():
         print(f"❌ Root endpoint error: {e}")
         return False
 
-def main():
+async def main():
     """Run all tests"""
     print("🚀 Starting EagleAI FastAPI Backend Tests")
     print("=" * 50)
     
-    # Test basic endpoints
-    basic_tests = [
-        test_health,
-        test_api_docs,
-        test_root_endpoint
-    ]
-    
-    passed = 0
-    total = len(basic_tests)
-    
-    for test in basic_tests:
-        if test():
-            passed += 1
-    
-    if passed < total:
-        print("❌ Basic tests failed. Is the server running?")
-        print("   Start the server with: python run.py")
-        return
-    
-    # Test student creation
-    student_id = test_create_student()
-    if not student_id:
-        print("❌ Student creation failed. Cannot continue with resume tests.")
-        return
-    
-    # Test resume operations
-    resume_tests = [
-        lambda: test_resume_upload(student_id),
-        lambda: test_get_resume(student_id),
-        lambda: test_resume_analysis(student_id),
-        lambda: test_resume_download(student_id)
-    ]
-    
-    for test in resume_tests:
-        if test():
+    # One client for the whole run so connections are kept alive and reused
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        # Test basic endpoints concurrently
+        basic_results = await asyncio.gather(
+            test_health(client),
+            test_api_docs(client),
+            test_root_endpoint(client)
+        )
+        
+        passed = sum(basic_results)
+        total = len(basic_results)
+        
+        if passed < total:
+            print("❌ Basic tests failed. Is the server running?")
+            print("   Start the server with: python run.py")
+            return
+        
+        # Test student creation
+        student_id = await test_create_student(client)
+        if not student_id:
+            print("❌ Student creation failed. Cannot continue with resume tests.")
+            return
+        
+        # Test resume operations (everything else depends on the upload)
+        if await test_resume_upload(client, student_id):
             passed += 1
         total += 1
+        
+        resume_results = await asyncio.gather(
+            test_get_resume(client, student_id),
+            test_resume_analysis(client, student_id),
+            test_resume_download(client, student_id)
+        )
+        passed += sum(resume_results)
+        total += len(resume_results)
     
     print("=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -220,4 +221,4 @@ def main():
         print("⚠️  Some tests failed. Check the errors above.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file